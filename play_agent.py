@@ -1,41 +1,42 @@
+import argparse
+import os
+
+import numpy as np
+
 import rlcard
 from rlcard.agents import NolimitholdemHumanAgent as HumanAgent
+from rlcard.agents.remote_agent import WorkerPool
 from rlcard.utils import print_card, load_model, get_device
-# Make environment
-env = rlcard.make('no-limit-holdem')
-device = get_device()
-human_agent = HumanAgent(env.num_actions)
-filepath = 'experiments/nolimit_holdem_dqn_basic/model.pth'
-self_learn_agent = load_model(filepath, env = env, position = 1, device = device)
-
-env.set_agents([human_agent, human_agent])
 
 
-while (True):
+def run_episode(env, agents):
     print(">> Start a new game")
 
+    env.set_agents(agents)
     trajectories, payoffs = env.run(is_training=False)
     # If the human does not take the final action, we need to
     # print other players action
     final_state = trajectories[0][-1]
     action_record = final_state['action_record']
     state = final_state['raw_obs']
+    current_player = state['current_player']
     _action_list = []
-    for i in range(1, len(action_record)+1):
-        if action_record[-i][0] == state['current_player']:
+    for record in reversed(action_record):
+        if record[0] == current_player:
             break
-        _action_list.insert(0, action_record[-i])
-    for pair in _action_list:
+        _action_list.append(record)
+    for pair in reversed(_action_list):
         print('>> Player', pair[0], 'chooses', pair[1])
 
     # Let's take a look at what the agent card is
     print('===============     Cards all Players    ===============')
-    for hands in env.get_perfect_information()['hand_cards']:
+    info = env.get_perfect_information()
+    for hands in info['hand_cards']:
         print_card(hands)
-    
-    if 'public_card' in env.get_perfect_information():
+
+    if 'public_card' in info:
         print('\n=============== Community Card ===============')
-        print_card(env.get_perfect_information()['public_card'])
+        print_card(info['public_card'])
 
     print('===============     Result     ===============')
     if payoffs[0] > 0:
@@ -46,4 +47,53 @@ while (True):
         print('You lose {} chips!'.format(-payoffs[0]))
     print('')
 
-    input("Press any key to continue...")
\ No newline at end of file
+    return payoffs
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("Play no-limit holdem")
+    parser.add_argument(
+        '--server',
+        action='store_true',
+        help='Let the model play itself, with the games in worker processes and the model serving their requests in batches',
+    )
+    parser.add_argument(
+        '--model_path',
+        type=str,
+        default='experiments/dqn_basic/model.pth',
+        help='The DQN model used by --server, saved by run_rl.py',
+    )
+    parser.add_argument(
+        '--num_workers',
+        type=int,
+        default=4,
+    )
+    parser.add_argument(
+        '--num_games',
+        type=int,
+        default=100,
+        help='Number of games played by each worker between two reports',
+    )
+    args = parser.parse_args()
+    if args.server and not os.path.isfile(args.model_path):
+        parser.error('--server needs a trained model, {} does not exist. Train one with run_rl.py'.format(args.model_path))
+
+    # Make environment
+    env = rlcard.make('no-limit-holdem')
+
+    if args.server:
+        # Only the server games need the model, so CUDA is not initialized for human games
+        device = get_device()
+        self_learn_agent = load_model(args.model_path, env = env, position = 1, device = device)
+        # The workers are started once and keep their environments between reports
+        with WorkerPool('no-limit-holdem', self_learn_agent, args.num_workers) as pool:
+            while (True):
+                results = pool.run(args.num_games)
+                payoffs = np.mean(np.array([_payoffs for _, _payoffs in results]), axis=0)
+                print('Average payoffs over {} games: {}'.format(len(results), payoffs))
+    else:
+        human_agent = HumanAgent(env.num_actions)
+        while (True):
+            run_episode(env, [human_agent, human_agent])
+
+            input("Press any key to continue...")
@@ -12,3 +12,4 @@ if 'torch' in installed_packages:
 from rlcard.agents.human_agents.limit_holdem_human_agent import HumanAgent as LimitholdemHumanAgent
 from rlcard.agents.human_agents.nolimit_holdem_human_agent import HumanAgent as NolimitholdemHumanAgent
 from rlcard.agents.random_agent import RandomAgent
+from rlcard.agents.remote_agent import RemoteAgent
@@ -185,6 +185,64 @@ class DQNAgent(object):
 
         return masked_q_values
 
+    def step_batch(self, states):
+        ''' Batched version of `step`, with a single forward pass for all the states
+
+        Args:
+            states (list): a list of states
+
+        Returns:
+            actions (list): an action id for each state
+        '''
+        q_values = self.predict_batch(states)
+        epsilon = self.epsilons[min(self.total_t, self.epsilon_decay_steps-1)]
+        actions = []
+        for state, q in zip(states, q_values):
+            legal_actions = list(state['legal_actions'].keys())
+            probs = np.ones(len(legal_actions), dtype=float) * epsilon / len(legal_actions)
+            best_action_idx = legal_actions.index(np.argmax(q))
+            probs[best_action_idx] += (1.0 - epsilon)
+            action_idx = np.random.choice(np.arange(len(probs)), p=probs)
+            actions.append(legal_actions[action_idx])
+
+        return actions
+
+    def eval_step_batch(self, states):
+        ''' Batched version of `eval_step`, with a single forward pass for all the states
+
+        Args:
+            states (list): a list of states
+
+        Returns:
+            (list): an (action, info) tuple for each state, as returned by `eval_step`
+        '''
+        q_values = self.predict_batch(states)
+        results = []
+        for state, q in zip(states, q_values):
+            legal_actions = list(state['legal_actions'].keys())
+            info = {}
+            info['values'] = {state['raw_legal_actions'][i]: float(q[legal_actions[i]]) for i in range(len(legal_actions))}
+            results.append((np.argmax(q), info))
+
+        return results
+
+    def predict_batch(self, states):
+        ''' Predict the masked Q-values of a batch of states
+
+        Args:
+            states (list): a list of states
+
+        Returns:
+            q_values (numpy.array): a 2-d array with one row of Q values per state
+        '''
+        q_values = self.q_estimator.predict_nograd(np.stack([state['obs'] for state in states]))
+        masked_q_values = -np.inf * np.ones((len(states), self.num_actions), dtype=float)
+        for i, state in enumerate(states):
+            legal_actions = list(state['legal_actions'].keys())
+            masked_q_values[i, legal_actions] = q_values[i, legal_actions]
+
+        return masked_q_values
+
     def train(self):
         ''' Train the network
 
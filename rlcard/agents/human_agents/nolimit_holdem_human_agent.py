@@ -49,12 +49,13 @@ def _print_state(state, action_record):
         state (dict): A dictionary of the raw state
         action_record (list): A list of the historical actions
     '''
+    current_player = state['current_player']
     _action_list = []
-    for i in range(1, len(action_record)+1):
-        if action_record[-i][0] == state['current_player']:
+    for record in reversed(action_record):
+        if record[0] == current_player:
             break
-        _action_list.insert(0, action_record[-i])
-    for pair in _action_list:
+        _action_list.append(record)
+    for pair in reversed(_action_list):
         print('>> Player', pair[0], 'chooses', pair[1])
 
     print('\n=============== Community Card ===============')
@@ -0,0 +1,264 @@
+''' Run the game logic in worker processes and the agent inference in the main process
+'''
+import queue
+import traceback
+
+from rlcard.utils.utils import batch_actions
+
+
+class RemoteAgent(object):
+    ''' A stub agent used inside a worker process. It forwards every state to
+        the inference server through the request queue and waits for the action
+        on its own reply queue.
+    '''
+
+    def __init__(self, worker_id, request_queue, reply_queue):
+        ''' Initialize the remote agent
+
+        Args:
+            worker_id (int): The id of the worker process that owns the agent
+            request_queue (Queue): The queue shared by all the workers to send states
+            reply_queue (Queue): The queue on which this worker receives actions
+        '''
+        self.use_raw = False
+        self.worker_id = worker_id
+        self.request_queue = request_queue
+        self.reply_queue = reply_queue
+
+    def step(self, state):
+        ''' Ask the server for an action for generating training data
+
+        Args:
+            state (dict): current state
+
+        Returns:
+            action (int): an action id
+        '''
+        self.request_queue.put((self.worker_id, state, True))
+        return self.reply_queue.get()
+
+    def eval_step(self, state):
+        ''' Ask the server for an action for evaluation purpose
+
+        Args:
+            state (dict): current state
+
+        Returns:
+            action (int): an action id
+            info (dict): An empty dictionary, the server only sends the action
+        '''
+        self.request_queue.put((self.worker_id, state, False))
+        return self.reply_queue.get(), {}
+
+
+def serve(agent, request_queue, reply_queues, max_batch_size=256, processes=None, poll_interval=1.0):
+    ''' Answer the requests of the workers until all of them are done with their current games
+
+    Each iteration blocks for one request, drains whatever else is already
+    waiting in the queue, and runs the agent once on the whole batch.
+
+    Args:
+        agent (object): The agent that makes the decisions
+        request_queue (Queue): The queue the workers send (worker_id, state, is_training) on.
+            A state of None means the worker is done, the last field is then the
+            traceback of the error that stopped the worker, or None.
+        reply_queues (list): The reply queue of each worker
+        max_batch_size (int): The maximum number of states answered at once
+        processes (list): The worker processes. If given, they are checked every
+            poll_interval seconds while no request comes, to detect a worker that died
+            without saying it was done.
+        poll_interval (float): The number of seconds between two checks of the processes
+
+    Raises:
+        RuntimeError: If a worker failed. The other workers are still served
+            until they are done before a worker error is raised, but a worker
+            that died is reported right away.
+    '''
+    done = set()
+    errors = []
+    exited = set()
+    while len(done) < len(reply_queues):
+        try:
+            requests = [request_queue.get(timeout=poll_interval if processes is not None else None)]
+        except queue.Empty:
+            for worker_id, p in enumerate(processes):
+                if worker_id in done or p.exitcode is None:
+                    continue
+                # What a process sent is readable once it has exited, so give it one more poll
+                if worker_id in exited:
+                    raise RuntimeError('Worker {} died with exit code {}'.format(worker_id, p.exitcode))
+                exited.add(worker_id)
+            continue
+        while len(requests) < max_batch_size:
+            try:
+                requests.append(request_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        batches = {True: [], False: []}
+        for worker_id, state, extra in requests:
+            if state is None:
+                done.add(worker_id)
+                if extra is not None:
+                    errors.append('Worker {} failed:\n{}'.format(worker_id, extra))
+            else:
+                batches[extra].append((worker_id, state))
+
+        for is_training, batch in batches.items():
+            if not batch:
+                continue
+            actions = batch_actions(agent, [state for _, state in batch], is_training)
+            for (worker_id, _), action in zip(batch, actions):
+                reply_queues[worker_id].put(action)
+
+    if errors:
+        raise RuntimeError('\n'.join(errors))
+
+
+def _worker(worker_id, env_id, config, is_training, command_queue, request_queue, reply_queue, result_queue):
+    ''' Play games with remote agents at every position and send the results back
+
+    The worker builds its environment once, then waits for commands: a number of
+    games to play, or None to stop. After each command it tells the server it is
+    done, with the traceback if it failed, in which case it stops.
+    '''
+    env = None
+    while True:
+        num_episodes = command_queue.get()
+        if num_episodes is None:
+            break
+
+        error = None
+        try:
+            if env is None:
+                import rlcard
+
+                env = rlcard.make(env_id, config=config)
+                agent = RemoteAgent(worker_id, request_queue, reply_queue)
+                env.set_agents([agent for _ in range(env.num_players)])
+
+            for _ in range(num_episodes):
+                result_queue.put(env.run(is_training=is_training))
+        except Exception:
+            error = traceback.format_exc()
+        finally:
+            request_queue.put((worker_id, None, error))
+        if error is not None:
+            break
+
+
+class WorkerPool(object):
+    ''' Worker processes that play games while the agent runs in this process
+
+    The workers run the game logic and send the states that need a decision to
+    this process, where the agent answers them in batches. The processes are
+    started once and kept alive between calls to `run`, call `close` (or use the
+    pool as a context manager) to stop them.
+    '''
+
+    def __init__(self, env_id, agent, num_workers, config={}, is_training=False):
+        ''' Start the worker processes
+
+        Args:
+            env_id (string): The name of the environment
+            agent (object): The agent that plays every position
+            num_workers (int): The number of worker processes
+            config (dict): A config dictionary for the environments. If a seed is
+                given, worker i is seeded with seed + i.
+            is_training (boolean): True if for training purpose.
+        '''
+        import torch.multiprocessing as mp
+
+        self.agent = agent
+        self.num_workers = num_workers
+
+        ctx = mp.get_context('spawn')
+        self.request_queue = ctx.Queue()
+        self.reply_queues = [ctx.Queue() for _ in range(num_workers)]
+        self.command_queues = [ctx.Queue() for _ in range(num_workers)]
+        self.result_queue = ctx.Queue()
+
+        self.processes = []
+        for worker_id in range(num_workers):
+            _config = dict(config)
+            if _config.get('seed') is not None:
+                _config['seed'] += worker_id
+            p = ctx.Process(target=_worker, args=(worker_id, env_id, _config, is_training,
+                                                  self.command_queues[worker_id], self.request_queue,
+                                                  self.reply_queues[worker_id], self.result_queue))
+            p.start()
+            self.processes.append(p)
+
+    def run(self, num_episodes):
+        ''' Let every worker play some games and answer their requests until they are done
+
+        Args:
+            num_episodes (int): The number of games played by each worker
+
+        Returns:
+            (list): The (trajectories, payoffs) of every game, as returned by `Env.run`
+
+        Raises:
+            RuntimeError: If a worker failed, see `serve`. The pool is then terminated.
+        '''
+        for command_queue in self.command_queues:
+            command_queue.put(num_episodes)
+
+        try:
+            serve(self.agent, self.request_queue, self.reply_queues, processes=self.processes)
+        except BaseException:
+            # The remaining workers may be waiting for an answer or for their results to be read
+            self.terminate()
+            raise
+
+        return [self.result_queue.get() for _ in range(self.num_workers * num_episodes)]
+
+    def close(self):
+        ''' Stop the workers and wait for them to exit
+        '''
+        for command_queue in self.command_queues:
+            command_queue.put(None)
+        for p in self.processes:
+            p.join()
+
+    def terminate(self):
+        ''' Kill the workers without waiting for them to finish their games
+        '''
+        for p in self.processes:
+            p.terminate()
+        for p in self.processes:
+            p.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+
+
+def run_with_workers(env_id, agent, num_workers, num_episodes, config={}, is_training=False):
+    ''' Play games in a temporary `WorkerPool`
+
+    Starting the processes is slow, keep a `WorkerPool` open to play several
+    batches of games.
+
+    Args:
+        env_id (string): The name of the environment
+        agent (object): The agent that plays every position
+        num_workers (int): The number of worker processes
+        num_episodes (int): The number of games played by each worker
+        config (dict): A config dictionary for the environments. If a seed is
+            given, worker i is seeded with seed + i.
+        is_training (boolean): True if for training purpose.
+
+    Returns:
+        (list): The (trajectories, payoffs) of every game, as returned by `Env.run`
+
+    Raises:
+        RuntimeError: If a worker failed, see `serve`
+    '''
+    with WorkerPool(env_id, agent, num_workers, config=config, is_training=is_training) as pool:
+        return pool.run(num_episodes)
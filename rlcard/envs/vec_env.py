@@ -0,0 +1,115 @@
+''' Vectorized environment that runs several independent games in lockstep
+'''
+from rlcard.envs.registration import make
+from rlcard.utils.utils import batch_actions
+
+
+class VecEnv(object):
+    '''
+    Hold several instances of the same environment and step them together, so
+    that the decisions an agent has to make in all of them can be computed with
+    one batched call (e.g. a single forward pass of a DQN) instead of one call
+    per game.
+    '''
+    def __init__(self, env_id, num_envs, config={}):
+        ''' Initialize the vectorized environment
+
+        Args:
+            env_id (string): The name of the environment
+            num_envs (int): The number of games played in parallel
+            config (dict): A config dictionary passed to every environment. If
+                a seed is given, environment i is seeded with seed + i so that
+                the games are different.
+        '''
+        self.envs = []
+        for i in range(num_envs):
+            _config = dict(config)
+            if _config.get('seed') is not None:
+                _config['seed'] += i
+            self.envs.append(make(env_id, config=_config))
+
+        self.num_envs = num_envs
+        self.num_players = self.envs[0].num_players
+        self.num_actions = self.envs[0].num_actions
+        self.state_shape = self.envs[0].state_shape
+        self.action_shape = self.envs[0].action_shape
+
+    def set_agents(self, agents):
+        '''
+        Set the agents that will interact with the environments.
+        This function must be called before `run`.
+
+        Args:
+            agents (list): List of Agent classes
+        '''
+        self.agents = agents
+        for env in self.envs:
+            env.set_agents(agents)
+
+    def run(self, is_training=False):
+        '''
+        Run one complete game in every environment. The games are stepped in
+        lockstep: at each sweep the pending states are grouped by the agent that
+        has to act, and every group is handed to the agent in one call.
+
+        Args:
+            is_training (boolean): True if for training purpose.
+
+        Returns:
+            (tuple) Tuple containing:
+
+                (list): The trajectories of each game, in the format of `Env.run`
+                (list): The payoffs of each game, in the format of `Env.run`
+        '''
+        envs = self.envs
+        trajectories = [[[] for _ in range(self.num_players)] for _ in envs]
+        states = [None for _ in envs]
+        player_ids = [None for _ in envs]
+
+        for i, env in enumerate(envs):
+            states[i], player_ids[i] = env.reset()
+            trajectories[i][player_ids[i]].append(states[i])
+
+        active = [i for i, env in enumerate(envs) if not env.is_over()]
+        while active:
+            # Group the pending decisions by agent, so an agent sitting at
+            # several positions (e.g. self-play) still gets a single batch
+            groups = {}
+            for i in active:
+                agent = self.agents[player_ids[i]]
+                groups.setdefault(id(agent), (agent, []))[1].append(i)
+
+            for agent, indices in groups.values():
+                actions = batch_actions(agent, [states[i] for i in indices], is_training)
+                for i, action in zip(indices, actions):
+                    env = envs[i]
+                    next_state, next_player_id = env.step(action, agent.use_raw)
+                    trajectories[i][player_ids[i]].append(action)
+                    states[i] = next_state
+                    player_ids[i] = next_player_id
+                    if not env.game.is_over():
+                        trajectories[i][next_player_id].append(next_state)
+
+            active = [i for i in active if not envs[i].is_over()]
+
+        # Add a final state to all the players and collect the payoffs
+        payoffs = []
+        for i, env in enumerate(envs):
+            for player_id in range(self.num_players):
+                trajectories[i][player_id].append(env.get_state(player_id))
+            payoffs.append(env.get_payoffs())
+
+        return trajectories, payoffs
+
+    def run_batched(self, agents, is_training=False):
+        ''' Set the agents and run one game in every environment
+
+        Args:
+            agents (list): List of Agent classes
+            is_training (boolean): True if for training purpose.
+
+        Returns:
+            (tuple): The trajectories and payoffs of each game, see `run`
+        '''
+        self.set_agents(agents)
+        return self.run(is_training=is_training)
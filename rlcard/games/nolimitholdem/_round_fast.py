@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""Compiled core of the no limit texas holdem Round
+
+The functions only take and return integers so they can be compiled with numba.
+If numba is not installed they run as plain Python.
+"""
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# One bit per action, indexed by Action value
+FOLD_BIT = 1 << 0
+CHECK_BIT = 1 << 1
+CALL_BIT = 1 << 2
+RAISE_QUARTER_POT_BIT = 1 << 3
+RAISE_HALF_POT_BIT = 1 << 4
+RAISE_POT_BIT = 1 << 5
+RAISE_2POT_BIT = 1 << 6
+ALL_IN_BIT = 1 << 7
+ALL_ACTIONS_MASK = 0xFF
+
+# Values of Action.CHECK and Action.CALL
+_CHECK = 1
+_CALL = 2
+
+# Action forbidden by the betting history, indexed by 3 * (is pre-flop) + kind of the last
+# action in the round (0: none, 1: check or call, 2: raise).
+# Cannot check as first action pre-flop, cannot call as first action post-flop,
+# cannot call after a check or call, and cannot check after a raise.
+_FORBID = (CALL_BIT, CALL_BIT, CHECK_BIT, CHECK_BIT, CALL_BIT, CHECK_BIT)
+
+
+@njit(cache=True)
+def legal_actions_mask(max_raised, cur_raised, pot, remained, round_counter, last_action_code):
+    """
+    Compute the legal actions of the current player as a bitmask
+
+    Args:
+        max_raised (int): The max raised amount of this round
+        cur_raised (int): The amount raised by the current player in this round
+        pot (int): The chips in the pot
+        remained (int): The chips remained to the current player
+        round_counter (int): The index of the betting round, 0 is pre-flop
+        last_action_code (int): The value of the last action of this round, -1 if there is none
+
+    Returns:
+        (int): The bitmask of legal actions
+    """
+    mask = ALL_ACTIONS_MASK
+
+    quarter = pot // 4
+    half = pot // 2
+    double = pot * 2
+    diff = max_raised - cur_raised
+
+    # If the current player has no more chips after call, we cannot raise
+    if diff > 0 and diff >= remained:
+        mask &= ~(RAISE_QUARTER_POT_BIT | RAISE_HALF_POT_BIT | RAISE_POT_BIT | RAISE_2POT_BIT | ALL_IN_BIT)
+    # Even if we can raise, we have to check remained chips
+    else:
+        if double > remained:
+            mask &= ~RAISE_2POT_BIT
+
+        if pot > remained:
+            mask &= ~RAISE_POT_BIT
+
+        # Can't raise if the total raise amount is leq than the max raise amount of this round
+        # If raise by pot, there is no such concern
+        if half > remained or half + cur_raised <= max_raised:
+            mask &= ~RAISE_HALF_POT_BIT
+
+        if quarter > remained or quarter + cur_raised <= max_raised:
+            mask &= ~RAISE_QUARTER_POT_BIT
+
+    if last_action_code < 0:
+        kind = 0
+    elif last_action_code == _CHECK or last_action_code == _CALL:
+        kind = 1
+    else:
+        kind = 2
+    if round_counter == 0:
+        kind += 3
+
+    return mask & ~_FORBID[kind]
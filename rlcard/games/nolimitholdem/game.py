@@ -149,7 +149,7 @@ class NolimitholdemGame(Game):
         players_in_bypass = [1 if player.status in (PlayerStatus.FOLDED, PlayerStatus.ALLIN) else 0 for player in self.players]
         if self.num_players - sum(players_in_bypass) == 1:
             last_player = players_in_bypass.index(0)
-            if self.round.raised[last_player] >= max(self.round.raised):
+            if self.round.raised[last_player] >= self.round.max_raised:
                 # If the last player has put enough chips, he is also bypassed
                 players_in_bypass[last_player] = 1
 
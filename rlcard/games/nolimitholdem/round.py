@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 """Implement no limit texas holdem Round class"""
-from enum import Enum
+from enum import Enum, IntEnum
+from functools import lru_cache
 from rlcard.games.limitholdem import PlayerStatus
+from rlcard.games.nolimitholdem._round_fast import legal_actions_mask
 
 
-class Action(Enum):
+class Action(IntEnum):
     FOLD = 0
     CHECK = 1
     CALL = 2
@@ -16,10 +18,37 @@ class Action(Enum):
     # SMALL_BLIND = 7
     # BIG_BLIND = 8
 
+    # Keep printing actions by name, e.g. Action.CALL, rather than by value
+    __str__ = Enum.__str__
+
+
+_BIT_TO_ACTION = tuple((1 << action.value, action) for action in Action)
+
+
+@lru_cache(maxsize=256)
+def _legal_actions(max_raised, cur_raised, pot, remained, round_counter, last_action_code):
+    """
+    Memoized legal actions, the result only depends on these integers (see legal_actions_mask)
+
+    Returns:
+        (tuple): The legal actions
+    """
+    mask = legal_actions_mask(max_raised, cur_raised, pot, remained, round_counter, last_action_code)
+    return tuple(action for bit, action in _BIT_TO_ACTION if mask & bit)
+
+
+# Enum members are singletons, so statuses can be compared by identity
+_FOLDED = PlayerStatus.FOLDED
+_ALLIN = PlayerStatus.ALLIN
+
 
 class NolimitholdemRound:
     """Round can call functions from other classes to keep the game running"""
 
+    __slots__ = ('np_random', 'game_pointer', 'num_players', 'init_raise_amount', 'dealer',
+                 'not_raise_num', 'not_playing_num', 'raised', '_max_raised', '_next', '_prev',
+                 '_legal_cache', '_legal_cache_key')
+
     def __init__(self, num_players, init_raise_amount, dealer, np_random):
         """
         Initialize the round class
@@ -45,6 +74,19 @@ class NolimitholdemRound:
         # Raised amount for each player
         self.raised = [0 for _ in range(self.num_players)]
 
+        # Largest amount raised by any player in this round, kept in sync with self.raised
+        self._max_raised = 0
+
+        # Ring of the players that have not folded, as next/previous player indices.
+        # Folding unlinks the player, so the next player to act is always self._next[game_pointer].
+        # Folded players stay folded for the whole game, so the ring is kept across rounds.
+        self._next = list(range(1, num_players)) + [0]
+        self._prev = [num_players - 1] + list(range(num_players - 1))
+
+        # Last legal actions computed, and the inputs of _legal_actions they were computed from
+        self._legal_cache = None
+        self._legal_cache_key = None
+
     def start_new_round(self, game_pointer, raised=None):
         """
         Start a new bidding round
@@ -59,8 +101,20 @@ class NolimitholdemRound:
         self.not_raise_num = 0
         if raised:
             self.raised = raised
+            self._max_raised = max(raised)
         else:
             self.raised = [0 for _ in range(self.num_players)]
+            self._max_raised = 0
+
+    @property
+    def max_raised(self):
+        """
+        The largest amount raised by any player in this round
+
+        Returns:
+            (int): The same value as max(self.raised)
+        """
+        return self._max_raised
 
     def proceed_round(self, players, action):
         """
@@ -75,66 +129,72 @@ class NolimitholdemRound:
         """
         player = players[self.game_pointer]
 
-        if action == Action.CHECK:
-            self.not_raise_num += 1
-        
-        elif action == Action.CALL:
-            diff = diff = max(self.raised) - self.raised[self.game_pointer]
-            self.raised[self.game_pointer] = max(self.raised)
-            player.bet(chips=diff)
-            self.not_raise_num += 1
+        if action == Action.FOLD:
+            new_status = _FOLDED
+            is_raise = False
+        else:
+            new_status = player.status
+            is_raise = _ACTION_HANDLERS[action](self, player)
 
-        elif action == Action.RAISE_QUARTER_POT:
-            quantity = int(self.dealer.pot / 4)
-            self.raised[self.game_pointer] += quantity
-            player.bet(chips=quantity)
-            self.not_raise_num = 1
-
-        elif action == Action.ALL_IN:
-            all_in_quantity = player.remained_chips
-            self.raised[self.game_pointer] = all_in_quantity + self.raised[self.game_pointer]
-            player.bet(chips=all_in_quantity)
-            self.not_raise_num = 1
-
-        elif action == Action.RAISE_POT:
-            self.raised[self.game_pointer] += self.dealer.pot
-            player.bet(chips=self.dealer.pot)
-            self.not_raise_num = 1
-
-        elif action == Action.RAISE_HALF_POT:
-            quantity = int(self.dealer.pot / 2)
-            self.raised[self.game_pointer] += quantity
-            player.bet(chips=quantity)
-            self.not_raise_num = 1
-        
-        elif action == Action.RAISE_2POT:
-            quantity = int(self.dealer.pot * 2)
-            self.raised[self.game_pointer] += quantity
-            player.bet(chips = quantity)
-            self.not_raise_num = 1
-
-        elif action == Action.FOLD:
-            player.status = PlayerStatus.FOLDED
-
-        if player.remained_chips < 0:
+        remained = player.remained_chips
+        if remained < 0:
             raise Exception("Player in negative stake")
 
-        if player.remained_chips == 0 and player.status != PlayerStatus.FOLDED:
-            player.status = PlayerStatus.ALLIN
-
-        self.game_pointer = (self.game_pointer + 1) % self.num_players
+        if remained == 0 and new_status is not _FOLDED:
+            new_status = _ALLIN
+        player.status = new_status
 
-        if player.status == PlayerStatus.ALLIN:
-            self.not_playing_num += 1
-            self.not_raise_num -= 1  # Because already counted in not_playing_num
-        if player.status == PlayerStatus.FOLDED:
+        # A raise reopens the betting, the other players have to act again
+        if is_raise:
+            self.not_raise_num = 0
+        # Folded and all-in players are counted in not_playing_num only
+        if new_status is _FOLDED or new_status is _ALLIN:
             self.not_playing_num += 1
+        else:
+            self.not_raise_num += 1
 
-        # Skip the folded players
-        while players[self.game_pointer].status == PlayerStatus.FOLDED:
-            self.game_pointer = (self.game_pointer + 1) % self.num_players
+        gp = self.game_pointer
+        if new_status is _FOLDED:
+            nxt = self._next[gp]
+            prv = self._prev[gp]
+            self._next[prv] = nxt
+            self._prev[nxt] = prv
+
+        # The ring skips the folded players
+        gp = self._next[gp]
+        self.game_pointer = gp
+        return gp
+
+    def _check(self, player):
+        return False
+
+    def _call(self, player):
+        diff = self._max_raised - self.raised[self.game_pointer]
+        self.raised[self.game_pointer] = self._max_raised
+        player.bet(chips=diff)
+        return False
 
-        return self.game_pointer
+    def _raise(self, player, quantity):
+        self.raised[self.game_pointer] += quantity
+        if self.raised[self.game_pointer] > self._max_raised:
+            self._max_raised = self.raised[self.game_pointer]
+        player.bet(chips=quantity)
+        return True
+
+    def _raise_quarter_pot(self, player):
+        return self._raise(player, self.dealer.pot // 4)
+
+    def _raise_half_pot(self, player):
+        return self._raise(player, self.dealer.pot // 2)
+
+    def _raise_pot(self, player):
+        return self._raise(player, self.dealer.pot)
+
+    def _raise_2pot(self, player):
+        return self._raise(player, self.dealer.pot * 2)
+
+    def _all_in(self, player):
+        return self._raise(player, player.remained_chips)
 
     def get_nolimit_legal_actions(self, players, action_history, round_counter):
         """
@@ -147,61 +207,17 @@ class NolimitholdemRound:
            (list):  A list of legal actions
         """
 
-        full_actions = list(Action)
-
-        # The player can always check or call
         player = players[self.game_pointer]
+        last_action_code = int(action_history[-1]) if action_history else -1
 
-        diff = max(self.raised) - self.raised[self.game_pointer]
-        
-        # If the current player has no more chips after call, we cannot raise
-        if diff > 0 and diff >= player.remained_chips:
-            full_actions.remove(Action.RAISE_HALF_POT)
-            full_actions.remove(Action.RAISE_POT)
-            full_actions.remove(Action.ALL_IN)
-            full_actions.remove(Action.RAISE_2POT)
-            full_actions.remove(Action.RAISE_QUARTER_POT)
-        # Even if we can raise, we have to check remained chips
-        else:
-            if self.dealer.pot * 2 > player.remained_chips:
-                full_actions.remove(Action.RAISE_2POT)
-
-            if self.dealer.pot > player.remained_chips:
-                full_actions.remove(Action.RAISE_POT)    
-
-            if int(self.dealer.pot / 2) > player.remained_chips:
-                full_actions.remove(Action.RAISE_HALF_POT)
-            
-            if int(self.dealer.pot / 4) > player.remained_chips:
-                full_actions.remove(Action.RAISE_QUARTER_POT)
-
-            # Can't raise if the total raise amount is leq than the max raise amount of this round
-            # If raise by pot, there is no such concern
-            if Action.RAISE_HALF_POT in full_actions and \
-                int(self.dealer.pot / 2) + self.raised[self.game_pointer] <= max(self.raised):
-                full_actions.remove(Action.RAISE_HALF_POT)
-
-            if Action.RAISE_QUARTER_POT in full_actions and \
-                int(self.dealer.pot / 4) + self.raised[self.game_pointer] <= max(self.raised):
-                full_actions.remove(Action.RAISE_QUARTER_POT)
-
-        # Cannot check as first action pre-flop
-        if round_counter == 0 and (len(action_history) == 0 or action_history[len(action_history) - 1] not in (Action.CHECK, Action.CALL)): 
-            full_actions.remove(Action.CHECK)
-
-        # Cannot call as first action post-flop
-        elif round_counter != 0 and len(action_history) == 0:
-            full_actions.remove(Action.CALL)
-
-        # Cannot call when the last action during round was either a check or call
-        elif len(action_history) != 0 and (action_history[len(action_history) - 1] in (Action.CHECK, Action.CALL)) :
-            full_actions.remove(Action.CALL)
-        
-        # Cannot check when the last action during round was a raise
-        elif len(action_history) != 0 and (action_history[len(action_history) - 1] not in (Action.CHECK, Action.CALL)):
-            full_actions.remove(Action.CHECK)
-
-        return full_actions
+        # The same state is usually queried several times in a row (legality check, state, decoding)
+        key = (self._max_raised, self.raised[self.game_pointer], self.dealer.pot,
+               player.remained_chips, round_counter, last_action_code)
+        if key != self._legal_cache_key:
+            self._legal_cache = _legal_actions(*key)
+            self._legal_cache_key = key
+
+        return list(self._legal_cache)
 
     def is_over(self):
         """
@@ -210,6 +226,16 @@ class NolimitholdemRound:
         Returns:
             (boolean): True if the current round is over
         """
-        if self.not_raise_num + self.not_playing_num >= self.num_players:
-            return True
-        return False
+        return self.not_raise_num + self.not_playing_num >= self.num_players
+
+
+# proceed_round dispatches the betting actions on Action value, folding only changes the status.
+# A handler applies the bet and returns True if the action is a raise.
+_ACTION_HANDLERS = [None] * len(Action)
+_ACTION_HANDLERS[Action.CHECK.value] = NolimitholdemRound._check
+_ACTION_HANDLERS[Action.CALL.value] = NolimitholdemRound._call
+_ACTION_HANDLERS[Action.RAISE_QUARTER_POT.value] = NolimitholdemRound._raise_quarter_pot
+_ACTION_HANDLERS[Action.RAISE_HALF_POT.value] = NolimitholdemRound._raise_half_pot
+_ACTION_HANDLERS[Action.RAISE_POT.value] = NolimitholdemRound._raise_pot
+_ACTION_HANDLERS[Action.RAISE_2POT.value] = NolimitholdemRound._raise_2pot
+_ACTION_HANDLERS[Action.ALL_IN.value] = NolimitholdemRound._all_in
@@ -195,6 +195,28 @@ def remove_illegal(action_probs, legal_actions):
         probs /= sum(probs)
     return probs
 
+def batch_actions(agent, states, is_training):
+    ''' Ask an agent for the actions of a batch of states
+
+    Agents that implement `step_batch`/`eval_step_batch` are queried once for
+    the whole batch, the others are queried state by state.
+
+    Args:
+        agent (object): The agent that has to act
+        states (list): The states of the games in which the agent acts
+        is_training (boolean): True if for training purpose.
+
+    Returns:
+        (list): One action per state
+    '''
+    if is_training:
+        if hasattr(agent, 'step_batch'):
+            return agent.step_batch(states)
+        return [agent.step(state) for state in states]
+    if hasattr(agent, 'eval_step_batch'):
+        return [action for action, _ in agent.eval_step_batch(states)]
+    return [agent.eval_step(state)[0] for state in states]
+
 def tournament(env, num):
     ''' Evaluate he performance of the agents in the environment
 
@@ -249,8 +271,13 @@ def plot_curve(csv_path, save_path, algorithm):
 
 def load_model(model_path, env=None, position=None, device=None):
     if os.path.isfile(model_path):  # Torch model
+        import inspect
         import torch
-        agent = torch.load(model_path, map_location=device)
+        # The whole agent is pickled, which torch >= 2.6 refuses to load by default
+        if 'weights_only' in inspect.signature(torch.load).parameters:
+            agent = torch.load(model_path, map_location=device, weights_only=False)
+        else:
+            agent = torch.load(model_path, map_location=device)
         agent.set_device(device)
     elif os.path.isdir(model_path):  # CFR model
         from rlcard.agents import CFRAgent